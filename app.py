@@ -4,15 +4,20 @@ Flask Web Application for ScotRail Train Travel Advisor
 Provides a web-based chat interface for the ScotRail AI agent.
 """
 
-from collections import OrderedDict
-from datetime import datetime, timedelta
-from threading import Lock
+import atexit
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from threading import BoundedSemaphore, Event, Lock, Thread
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import queue
+import re
 import time
 import os
 
 from flask import Flask, render_template, request, jsonify, session
+from flask.json.provider import DefaultJSONProvider
+import orjson
 import secrets
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
@@ -25,23 +30,98 @@ from dependencies import get_container
 # Load configuration
 config = get_config()
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider backed by orjson.
+    
+    Agent replies are multi-KB strings, so encoding dominates response-side
+    CPU on the chat endpoint. orjson writes bytes directly; ``response``
+    uses them as the body without a round trip through ``str``. Datetimes are
+    passed through to Flask's default hook so they keep the HTTP date format.
+    """
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(
+            obj, default=self.default, option=self._options(kwargs.get('indent'))
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=self._options(indent) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.secret_key = config.flask_secret_key
 app.config['TESTING'] = config.testing
+app.config['MAX_CONTENT_LENGTH'] = config.max_content_length  # Werkzeug rejects larger bodies unread
+
+
+@app.before_request
+def _health_fast_path():
+    """
+    Answer health probes before rate limiting and HTTPS redirects.
+    
+    Registered ahead of Flask-Limiter and Talisman so load-balancer probes
+    (often plain HTTP) are neither counted nor redirected.
+    """
+    if request.path == '/api/health' and request.method == 'GET':
+        return health_check()
+
 
 # Initialize limiter - will be enabled/disabled based on runtime configuration
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=[],  # Set per-endpoint limits instead
-    storage_uri="memory://",
-    strategy="fixed-window"
+    storage_uri=config.rate_limit_storage_uri,
+    # Keep limiting in-process if a shared backend such as Redis is unreachable
+    in_memory_fallback_enabled=config.rate_limit_storage_uri != "memory://",
+    # Two counters per key instead of moving-window's timestamp log, without
+    # fixed-window's 2x burst across a boundary
+    strategy="sliding-window-counter",
+    enabled=config.rate_limit_enabled
 )
 
-def should_limit():
-    """Check if rate limiting should be applied (not in testing mode)."""
-    # Use app.config['TESTING'] so tests can modify it dynamically
-    return not app.config.get('TESTING', False) and config.rate_limit_enabled
+def _rate_limit_exempt():
+    """Exempt requests from rate limiting in testing mode."""
+    # Read app.config['TESTING'] at request time so tests can modify it dynamically
+    return app.config['TESTING']
+
+
+@app.errorhandler(429)
+def rate_limit_exceeded(e):
+    """Return rate-limit rejections in the same JSON envelope as other API errors."""
+    response = jsonify({
+        'error': f'Rate limit exceeded ({e.description}), please retry later',
+        'code': 'agent.rate_limited',
+        'success': False
+    })
+    # Set here rather than via the limiter's headers_enabled, whose
+    # after-request hook would also stamp 200s and the busy-session 429
+    current = limiter.current_limit
+    if current is not None:
+        response.headers['Retry-After'] = str(max(1, int(current.reset_at - time.time())))
+    return response, 429
+
 
 # Configure CORS
 if config.cors_enabled:
@@ -62,7 +142,7 @@ console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.INFO)
 console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 console_handler.setFormatter(console_formatter)
-logger.addHandler(console_handler)
+log_handlers = [console_handler]
 
 # File handler for production (if not in debug mode)
 if not app.debug and not config.testing:
@@ -74,7 +154,17 @@ if not app.debug and not config.testing:
         '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    log_handlers.append(file_handler)
+
+# Request threads only enqueue records; a background listener does the
+# console/file I/O (and rotation checks) off the request path
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+logger.addHandler(QueueHandler(log_queue))
+
+if len(log_handlers) > 1:  # file logging enabled
     logger.info('ScotRail Train Travel Advisor startup')
 
 # Configure HTTPS enforcement with Talisman (disabled in debug/testing mode)
@@ -107,88 +197,252 @@ else:
         logger.info('HTTPS enforcement disabled by configuration (HTTPS_ENABLED=false)')
 
 
+# Suspicious patterns for basic XSS prevention, matched in a single case-insensitive pass
+_SUSPICIOUS_PATTERN = re.compile(r'<script|javascript:|on(?:error|click|load)\s*=', re.IGNORECASE)
+
+
 def validate_message_content(message: str) -> tuple[bool, str]:
     """Validate message content and return (is_valid, error_message)."""
-    if not message or not message.strip():
-        return False, "Message cannot be empty"
-    
+    # Length first: rejecting oversized input needs no copy of it
     if len(message) > config.max_message_length:
         return False, f"Message too long (max {config.max_message_length} characters)"
     
-    if len(message.strip()) < config.min_message_length:
+    stripped = message.strip()
+    if not stripped:
+        return False, "Message cannot be empty"
+    
+    if len(stripped) < config.min_message_length:
         return False, f"Message too short (min {config.min_message_length} character)"
     
     # Check for suspicious patterns (basic XSS prevention)
-    suspicious_patterns = ['<script', 'javascript:', 'onerror=', 'onclick=', 'onload=']
-    message_lower = message.lower()
-    for pattern in suspicious_patterns:
-        if pattern in message_lower:
-            return False, "Message contains invalid content"
+    if _SUSPICIOUS_PATTERN.search(message):
+        return False, "Message contains invalid content"
     
     return True, ""
 
 
+@dataclass(slots=True)
+class SessionEntry:
+    """A session's agent and when it was last used (time.monotonic())."""
+    agent: ScotRailAgent
+    last_access: float
+
+
 # Store agent instances per session with LRU eviction
-agents = OrderedDict()
-session_metadata = {}  # Track last access time
+agents: OrderedDict[str, SessionEntry] = OrderedDict()
 agents_lock = Lock()
+SESSION_TTL_SECONDS = config.session_ttl_hours * 3600
+_creation_locks = [Lock() for _ in range(16)]  # striped by session id for agent construction
+
+# Chat concurrency limits: a global cap on in-flight LLM calls plus a
+# per-session cap (an agent's conversation history is not thread-safe)
+CHAT_BUSY_RETRY_AFTER_SECONDS = 2
+_chat_slots = BoundedSemaphore(config.max_concurrent_chats)
+_inflight_chats = {}
+_inflight_lock = Lock()
+
+# Optional warm pool of pre-built agents for new sessions. Agents embed the
+# current time in their system prompt, so pooled agents older than
+# AGENT_POOL_MAX_AGE_SECONDS are discarded instead of handed out.
+AGENT_POOL_MAX_AGE_SECONDS = 300
+_agent_pool = queue.Queue(maxsize=max(config.agent_pool_size, 1))
+_agent_pool_refill = Event()
 
 
 def _cleanup_expired_sessions():
-    """Remove sessions older than configured TTL."""
-    now = datetime.now()
-    expired = [
-        sid for sid, last_access in session_metadata.items()
-        if now - last_access > timedelta(hours=config.session_ttl_hours)
-    ]
+    """
+    Remove sessions older than configured TTL.
+    
+    ``agents`` is kept in least-recently-used order, so expired sessions are
+    always at the head; the walk stops at the first live session.
+    """
+    cutoff = time.monotonic() - SESSION_TTL_SECONDS
+    expired = 0
+    while agents:
+        if next(iter(agents.values())).last_access >= cutoff:
+            break
+        agents.popitem(last=False)
+        expired += 1
     if expired:
-        logger.info(f"Cleaning up {len(expired)} expired sessions")
-    for sid in expired:
-        agents.pop(sid, None)
-        session_metadata.pop(sid, None)
+        logger.info("Cleaned up %d expired sessions", expired)
+
+
+def _cleanup_loop():
+    """Background loop that sweeps expired sessions off the request path."""
+    while True:
+        time.sleep(config.session_cleanup_interval_seconds)
+        with agents_lock:
+            _cleanup_expired_sessions()
+
+
+def _acquire_chat_slot(session_id):
+    """Reserve a chat slot for the session without blocking; False if at either limit."""
+    with _inflight_lock:
+        in_flight = _inflight_chats.get(session_id, 0)
+        if in_flight >= config.max_concurrent_chats_per_session:
+            return False
+        if not _chat_slots.acquire(blocking=False):
+            return False
+        _inflight_chats[session_id] = in_flight + 1
+    return True
+
+
+def _release_chat_slot(session_id):
+    """Release a slot reserved by ``_acquire_chat_slot``."""
+    with _inflight_lock:
+        remaining = _inflight_chats.pop(session_id) - 1
+        if remaining:
+            _inflight_chats[session_id] = remaining
+    _chat_slots.release()
+
+
+def _take_pooled_agent():
+    """Return a recently built agent from the warm pool, or None if none is available."""
+    if config.agent_pool_size <= 0:
+        return None
+    _agent_pool_refill.set()
+    while True:
+        try:
+            built_at, agent = _agent_pool.get_nowait()
+        except queue.Empty:
+            return None
+        if time.monotonic() - built_at < AGENT_POOL_MAX_AGE_SECONDS:
+            return agent
+
+
+def _top_up_agent_pool():
+    """Replace pooled agents past half their max age, then fill the pool back up."""
+    replace_before = time.monotonic() - AGENT_POOL_MAX_AGE_SECONDS / 2
+    kept = []
+    while True:
+        try:
+            entry = _agent_pool.get_nowait()
+        except queue.Empty:
+            break
+        if entry[0] >= replace_before:
+            kept.append(entry)
+    for entry in kept:
+        _agent_pool.put_nowait(entry)
+    while not _agent_pool.full():
+        try:
+            agent = get_container().create_agent(ScotRailAgent)
+        except Exception as e:
+            logger.warning("Agent pool refill failed: %s", e)
+            break
+        _agent_pool.put((time.monotonic(), agent))
+
+
+def _refill_agent_pool():
+    """
+    Background loop that keeps the warm pool full and fresh.
+    
+    Wakes whenever an agent is taken, and at least every half max age so
+    idle pooled agents are replaced before they expire.
+    """
+    while True:
+        _agent_pool_refill.wait(AGENT_POOL_MAX_AGE_SECONDS / 2)
+        _agent_pool_refill.clear()
+        _top_up_agent_pool()
+
+
+def _touch_session(session_id):
+    """Return the session's agent and mark it most recently used. Caller holds ``agents_lock``."""
+    entry = agents.get(session_id)
+    if entry is None:
+        return None
+    agents.move_to_end(session_id)
+    entry.last_access = time.monotonic()
+    return entry.agent
 
 
 def get_or_create_agent(session_id):
     """Get existing agent for session or create new one with LRU eviction."""
     with agents_lock:
-        # Clean expired sessions
-        _cleanup_expired_sessions()
-        
-        # Update or create session
-        if session_id in agents:
-            # Move to end (most recently used)
-            agents.move_to_end(session_id)
-            session_metadata[session_id] = datetime.now()
-            return agents[session_id], None
+        agent = _touch_session(session_id)
+        if agent is not None:
+            return agent, None
+    
+    # Build the agent outside agents_lock so slow construction doesn't block
+    # other sessions; the striped lock stops concurrent first requests for
+    # the same session from building two agents
+    with _creation_locks[hash(session_id) % len(_creation_locks)]:
+        with agents_lock:
+            agent = _touch_session(session_id)
+            if agent is not None:
+                return agent, None
         
         # Create new agent - use DI container for both production and testing
         try:
-            if len(agents) >= config.max_sessions:
-                # Remove oldest session (LRU eviction)
-                oldest_id, _ = agents.popitem(last=False)
-                session_metadata.pop(oldest_id, None)
-                logger.info(f"LRU eviction: removed session {oldest_id[:8]}... (total sessions: {len(agents)})")
-            
-            # Always use DI container - this allows test mocks to be injected
-            container = get_container()
-            agents[session_id] = container.create_agent(ScotRailAgent)
-            
-            session_metadata[session_id] = datetime.now()
-            logger.info(f"Created new agent for session {session_id[:8]}... (total sessions: {len(agents)})")
-            return agents[session_id], None
-            
+            agent = _take_pooled_agent()
+            if agent is None:
+                # Always use DI container - this allows test mocks to be injected
+                container = get_container()
+                agent = container.create_agent(ScotRailAgent)
         except ValueError as e:
-            logger.error(f"Agent initialization failed for session {session_id[:8]}...: {str(e)}")
+            logger.error("Agent initialization failed for session %.8s...: %s", session_id, e)
             return None, str(e)
         except Exception as e:
-            logger.error(f"Agent initialization error for session {session_id[:8]}...: {str(e)}", exc_info=True)
+            logger.error("Agent initialization error for session %.8s...: %s", session_id, e, exc_info=True)
             return None, f"Failed to initialize agent: {str(e)}"
+        
+        with agents_lock:
+            if len(agents) >= config.max_sessions:
+                # Remove oldest session (LRU eviction)
+                oldest_id, _ = agents.popitem(last=False)
+                logger.info("LRU eviction: removed session %.8s... (total sessions: %d)", oldest_id, len(agents))
+            
+            agents[session_id] = SessionEntry(agent, time.monotonic())
+            total_sessions = len(agents)
+        
+        logger.info("Created new agent for session %.8s... (total sessions: %d)", session_id, total_sessions)
+        return agent, None
+
+
+if not config.testing:
+    Thread(target=_cleanup_loop, name='session-cleanup', daemon=True).start()
+
+if config.agent_pool_size > 0 and not config.testing:
+    Thread(target=_refill_agent_pool, name='agent-pool-refill', daemon=True).start()
+    _agent_pool_refill.set()
+    logger.info("Agent warm pool enabled (size: %d)", config.agent_pool_size)
+
+
+SESSION_ID_BYTES = 16
+SESSION_ID_BATCH = 256  # IDs drawn per CSPRNG read
+_session_id_pool = deque()
+_session_id_lock = Lock()
+
+
+def _new_session_id():
+    """
+    Return a fresh 32-character hex session ID.
+    
+    IDs are drawn from the OS CSPRNG in batches of SESSION_ID_BATCH, so a
+    burst of new sessions costs one urandom read instead of one per session.
+    """
+    with _session_id_lock:
+        if not _session_id_pool:
+            buf = secrets.token_bytes(SESSION_ID_BYTES * SESSION_ID_BATCH)
+            _session_id_pool.extend(
+                buf[i:i + SESSION_ID_BYTES].hex()
+                for i in range(0, len(buf), SESSION_ID_BYTES)
+            )
+        return _session_id_pool.popleft()
+
+
+def _ensure_session_id():
+    """Return the current session's ID, creating one on first use."""
+    session_id = session.get('session_id')
+    if not session_id:
+        session_id = session['session_id'] = _new_session_id()
+        logger.info("New session created: %.8s... from %s", session_id, request.remote_addr)
+    return session_id
 
 
 @app.route('/')
 def index():
     """Redirect to main chat interface."""
-    logger.debug(f"Index page accessed from {request.remote_addr}")
+    logger.debug("Index page accessed from %s", request.remote_addr)
     return render_template('index.html')
 
 
@@ -196,66 +450,77 @@ def index():
 def train_travel_advisor():
     """Main chat interface for train travel advisor."""
     # Initialize session if needed
-    if 'session_id' not in session:
-        session['session_id'] = secrets.token_hex(16)
-        logger.info(f"New session created: {session['session_id'][:8]}... from {request.remote_addr}")
-    else:
-        logger.debug(f"Existing session {session['session_id'][:8]}... accessed chat interface")
+    session_id = _ensure_session_id()
+    logger.debug("Session %.8s... accessed chat interface", session_id)
     
     return render_template('chat.html')
 
 
 @app.route('/api/chat', methods=['POST'])
-@limiter.limit(config.rate_limit_chat, exempt_when=lambda: app.config.get('TESTING', False))
+@limiter.limit(config.rate_limit_chat, exempt_when=_rate_limit_exempt)
 def chat():
     """Handle chat messages from the user."""
     start_time = time.time()
-    session_id = session.get('session_id', 'unknown')
+    session_id = _ensure_session_id()
+    short_id = session_id[:8]  # log prefix, sliced once per request
     
     try:
+        # Reject oversized bodies before reading or parsing them
+        if request.content_length is not None and request.content_length > config.max_content_length:
+            logger.warning("Oversized request (%d bytes) from session %s...", request.content_length, short_id)
+            return jsonify({'error': 'Request body too large'}), 413
+        
         # Validate content type
         if not request.is_json:
-            logger.warning(f"Invalid content type from session {session_id[:8]}...")
+            logger.warning("Invalid content type from session %s...", short_id)
             return jsonify({'error': 'Content-Type must be application/json'}), 400
         
-        # Validate JSON structure
-        data = request.get_json()
+        # Validate JSON structure (malformed bodies come back as None rather than raising)
+        data = request.get_json(silent=True)
         if not isinstance(data, dict):
-            logger.warning(f"Invalid JSON format from session {session_id[:8]}...")
+            logger.warning("Invalid JSON format from session %s...", short_id)
             return jsonify({'error': 'Invalid JSON format'}), 400
         
         # Get and validate message
         user_message = data.get('message', '')
         if not isinstance(user_message, str):
-            logger.warning(f"Non-string message from session {session_id[:8]}...")
+            logger.warning("Non-string message from session %s...", short_id)
             return jsonify({'error': 'Message must be a string'}), 400
         
         user_message = user_message.strip()
         
-        logger.info(f"Chat request from session {session_id[:8]}..., message length: {len(user_message)} chars")
+        logger.debug("Chat request from session %s..., message length: %d chars", short_id, len(user_message))
         
         # Validate message content
         is_valid, error_msg = validate_message_content(user_message)
         if not is_valid:
-            logger.warning(f"Invalid message from session {session_id[:8]}...: {error_msg}")
+            logger.warning("Invalid message from session %s...: %s", short_id, error_msg)
             return jsonify({'error': error_msg}), 400
         
         # Get or create agent for this session
-        if not session_id or session_id == 'unknown':
-            session['session_id'] = secrets.token_hex(16)
-            session_id = session['session_id']
-            logger.info(f"Created session ID for anonymous request: {session_id[:8]}...")
-        
         agent, error = get_or_create_agent(session_id)
         if error:
-            logger.error(f"Failed to get agent for session {session_id[:8]}...: {error}")
+            logger.error("Failed to get agent for session %s...: %s", short_id, error)
             return jsonify({'error': error}), 500
         
-        # Get response from agent
-        response = agent.chat(user_message)
+        # Get response from agent, shedding load rather than queueing behind slow LLM calls
+        if not _acquire_chat_slot(session_id):
+            logger.warning("Chat busy for session %s..., rejecting request", short_id)
+            busy = jsonify({
+                'error': 'Too many requests in progress, please retry shortly',
+                'code': 'agent.rate_limited',
+                'success': False
+            })
+            busy.headers['Retry-After'] = str(CHAT_BUSY_RETRY_AFTER_SECONDS)
+            return busy, 429
+        try:
+            response = agent.chat(user_message)
+        finally:
+            _release_chat_slot(session_id)
         
         duration = time.time() - start_time
-        logger.info(f"Chat response sent to session {session_id[:8]}... in {duration:.2f}s, response length: {len(response)} chars")
+        logger.info("Chat response sent to session %s... in %.2fs, response length: %d chars",
+                    short_id, duration, len(response))
         
         # Return response with optional timetable data
         result = {
@@ -264,17 +529,19 @@ def chat():
         }
         
         # Include timetable data if available
-        if hasattr(agent, 'last_timetable_data') and agent.last_timetable_data:
-            result['timetable'] = agent.last_timetable_data
-            logger.info(f"Including timetable data: {agent.last_timetable_data.get('type')} with {len(agent.last_timetable_data.get('trains', []))} trains")
+        timetable = getattr(agent, 'last_timetable_data', None)
+        if timetable:
+            result['timetable'] = timetable
+            logger.info("Including timetable data: %s with %d trains",
+                        timetable.get('type'), len(timetable.get('trains', ())))
         else:
-            logger.info(f"No timetable data available (hasattr: {hasattr(agent, 'last_timetable_data')}, value: {getattr(agent, 'last_timetable_data', None)})")
+            logger.debug("No timetable data available (value=%r)", timetable)
         
         return jsonify(result)
     
     except Exception as e:
         duration = time.time() - start_time
-        logger.error(f"Chat error for session {session_id[:8]}... after {duration:.2f}s: {str(e)}", exc_info=True)
+        logger.error("Chat error for session %s... after %.2fs: %s", short_id, duration, e, exc_info=True)
         return jsonify({
             'error': f'An error occurred: {str(e)}',
             'success': False
@@ -282,26 +549,28 @@ def chat():
 
 
 @app.route('/api/reset', methods=['POST'])
-@limiter.limit(config.rate_limit_chat, exempt_when=lambda: app.config.get('TESTING', False))
+@limiter.limit(config.rate_limit_chat, exempt_when=_rate_limit_exempt)
 def reset_conversation():
     """Reset the conversation history."""
     session_id = session.get('session_id', 'unknown')
+    short_id = session_id[:8]
     
     try:
-        if session_id and session_id != 'unknown' and session_id in agents:
-            agents[session_id].reset_conversation()
-            logger.info(f"Conversation reset for session {session_id[:8]}...")
+        entry = agents.get(session_id)
+        if entry is not None:
+            entry.agent.reset_conversation()
+            logger.info("Conversation reset for session %s...", short_id)
             return jsonify({
                 'success': True,
                 'message': 'Conversation reset successfully'
             })
-        logger.debug(f"Reset requested for session {session_id[:8]}... with no active conversation")
+        logger.debug("Reset requested for session %s... with no active conversation", short_id)
         return jsonify({
             'success': True,
             'message': 'No active conversation to reset'
         })
     except Exception as e:
-        logger.error(f"Failed to reset conversation for session {session_id[:8]}...: {str(e)}", exc_info=True)
+        logger.error("Failed to reset conversation for session %s...: %s", short_id, e, exc_info=True)
         return jsonify({
             'error': f'Failed to reset conversation: {str(e)}',
             'success': False
@@ -309,10 +578,8 @@ def reset_conversation():
 
 
 @app.route('/api/health', methods=['GET'])
-@limiter.limit(config.rate_limit_health, exempt_when=lambda: app.config.get('TESTING', False))
 def health_check():
-    """Health check endpoint."""
-    logger.debug(f"Health check from {request.remote_addr}")
+    """Health check endpoint (answered by ``_health_fast_path`` before other hooks)."""
     return jsonify({
         'status': 'healthy',
         'service': 'ScotRail Train Travel Advisor',
@@ -348,4 +615,4 @@ if __name__ == '__main__':
     if missing_keys:
         logger.warning(f'Missing recommended configuration: {", ".join(missing_keys)}')
     
-    app.run(debug=debug_mode, host=config.flask_host, port=config.flask_port)
+    app.run(debug=debug_mode, host=config.flask_host, port=config.flask_port, threaded=True)
@@ -48,14 +48,14 @@ class AppConfig(BaseSettings):
         default="10 per minute",
         description="Rate limit for chat endpoint"
     )
-    rate_limit_health: str = Field(
-        default="60 per minute",
-        description="Rate limit for health endpoint"
-    )
     rate_limit_default: str = Field(
         default="100 per hour",
         description="Default rate limit"
     )
+    rate_limit_storage_uri: str = Field(
+        default="memory://",
+        description="Rate limit counter storage (e.g. redis://host:6379 to share limits across workers)"
+    )
     
     # CORS Configuration
     cors_enabled: bool = Field(
@@ -82,6 +82,10 @@ class AppConfig(BaseSettings):
         default=1,
         description="Minimum message length in characters"
     )
+    max_content_length: int = Field(
+        default=64 * 1024,
+        description="Maximum request body size in bytes (larger bodies are rejected with 413)"
+    )
     
     # Session Management Configuration
     max_sessions: int = Field(
@@ -92,6 +96,22 @@ class AppConfig(BaseSettings):
         default=24,
         description="Session time-to-live in hours"
     )
+    session_cleanup_interval_seconds: int = Field(
+        default=60,
+        description="Seconds between background expired-session sweeps"
+    )
+    max_concurrent_chats: int = Field(
+        default=16,
+        description="Maximum chat requests processed at once across all sessions"
+    )
+    max_concurrent_chats_per_session: int = Field(
+        default=1,
+        description="Maximum chat requests processed at once for a single session"
+    )
+    agent_pool_size: int = Field(
+        default=0,
+        description="Number of pre-built agents kept warm for new sessions (0 disables the pool)"
+    )
     
     # OpenAI Configuration
     openai_api_key: Optional[str] = Field(
@@ -92,12 +92,12 @@ class ServiceContainer:
             if os.path.exists(msn_path):
                 try:
                     self._station_resolver = StationResolver(msn_path)
-                    logger.info(f"Station resolver initialized with {len(self._station_resolver)} stations")
+                    logger.info("Station resolver initialized with %d stations", len(self._station_resolver))
                 except Exception as e:
-                    logger.warning(f"Could not initialize station resolver: {e}")
+                    logger.warning("Could not initialize station resolver: %s", e)
                     self._station_resolver = None
             else:
-                logger.warning(f"MSN file not found at {msn_path}. Station name resolution disabled.")
+                logger.warning("MSN file not found at %s. Station name resolution disabled.", msn_path)
                 self._station_resolver = None
                 
         return self._station_resolver
@@ -121,7 +121,7 @@ class ServiceContainer:
                 )
                 logger.info("TimetableTools initialized for schedule queries")
             except Exception as e:
-                logger.warning(f"Could not initialize timetable tools: {e}")
+                logger.warning("Could not initialize timetable tools: %s", e)
                 self._timetable_tools = None
                 
         return self._timetable_tools
@@ -45,6 +45,252 @@ CONTEXT_WARNING_THRESHOLD = 100000  # Warn when approaching token limit (for est
 MAX_CONTEXT_TOKENS = config.max_context_tokens
 SAFETY_MARGIN_TOKENS = config.safety_margin_tokens
 
+# OpenAI function schemas for the agent's tools (static; built once)
+TOOLS = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_departure_board",
+            "description": "Fetch basic departure board information for a station. Returns scheduled time, estimated time, destination, platform, and operating company for upcoming trains.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "station_code": {
+                        "type": "string",
+                        "description": "Three-letter CRS station code (e.g., 'EDB' for Edinburgh, 'GLC' for Glasgow Central, 'ABD' for Aberdeen, 'PYL' for Perth)"
+                    },
+                    "num_rows": {
+                        "type": "integer",
+                        "description": "Maximum number of departures to return (default: 10)",
+                        "default": 10
+                    }
+                },
+                "required": ["station_code"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_next_departures_with_details",
+            "description": "Fetch comprehensive departure information with service details including cancellation status, delay reasons, service IDs, and train characteristics. Supports filtering to specific destinations.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "station_code": {
+                        "type": "string",
+                        "description": "Three-letter CRS station code (e.g., 'EDB', 'GLC', 'ABD')"
+                    },
+                    "filter_list": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Optional list of destination CRS codes to filter results. Omit for all departures."
+                    },
+                    "time_offset": {
+                        "type": "integer",
+                        "description": "Minutes from now to start search (default: 0)",
+                        "default": 0
+                    },
+                    "time_window": {
+                        "type": "integer",
+                        "description": "Search window in minutes (default: 120)",
+                        "default": 120
+                    }
+                },
+                "required": ["station_code"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_service_details",
+            "description": "Retrieve detailed information about a specific train service including the complete calling pattern (all stops), real-time status, cancellations, delays, and operator information. Requires a service_id obtained from get_next_departures_with_details.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "service_id": {
+                        "type": "string",
+                        "description": "Unique service identifier obtained from get_next_departures_with_details"
+                    }
+                },
+                "required": ["service_id"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_station_messages",
+            "description": "Retrieve service disruption messages and incident information. Returns delays, cancellations, engineering works, and other service disruptions. Can filter by station or return all network-wide incidents.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "station_code": {
+                        "type": "string",
+                        "description": "Optional three-letter CRS code to filter incidents. Omit for network-wide incidents."
+                    }
+                },
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_current_time",
+            "description": "Get the current date and time. Use this to understand what time it is now when users ask about trains leaving 'now', 'soon', 'today', or any time-relative questions.",
+            "parameters": {
+                "type": "object",
+                "properties": {},
+                "required": []
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "resolve_station_name",
+            "description": "Resolve a station name or partial name to its official 3-letter CRS code. Supports fuzzy matching for typos and partial names (e.g., 'edinburgh' → 'EDB', 'glasgow central' → 'GLC'). Use this when users provide station names instead of codes, or when you're unsure of the exact CRS code.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "station_name": {
+                        "type": "string",
+                        "description": "Station name or partial name to search for (e.g., 'edinburgh', 'glasgow central', 'inverness')"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Maximum number of matching stations to return (default: 5)",
+                        "default": 5
+                    }
+                },
+                "required": ["station_name"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "get_scheduled_trains",
+            "description": "Find scheduled trains between two stations on a specific date. Use this to see all scheduled services, journey times, and plan ahead. Complements real-time data which only shows ~2 hours ahead.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "from_station": {
+                        "type": "string",
+                        "description": "Departure station name or CRS code (e.g., 'Edinburgh' or 'EDB')"
+                    },
+                    "to_station": {
+                        "type": "string",
+                        "description": "Arrival station name or CRS code (e.g., 'Glasgow' or 'GLC')"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format (e.g., '2025-12-01')"
+                    },
+                    "departure_time": {
+                        "type": "string",
+                        "description": "Optional minimum departure time in HH:MM format (e.g., '09:30')"
+                    }
+                },
+                "required": ["from_station", "to_station", "travel_date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_journey_route",
+            "description": "Plan a journey with connections between stations. Finds optimal routes considering interchange times and connection possibilities.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "from_station": {
+                        "type": "string",
+                        "description": "Departure station name or CRS code"
+                    },
+                    "to_station": {
+                        "type": "string",
+                        "description": "Arrival station name or CRS code"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format"
+                    },
+                    "departure_time": {
+                        "type": "string",
+                        "description": "Minimum departure time in HH:MM format"
+                    },
+                    "max_changes": {
+                        "type": "integer",
+                        "description": "Maximum number of connections/changes (default: 2)"
+                    }
+                },
+                "required": ["from_station", "to_station", "travel_date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_schedule_vs_actual",
+            "description": "Compare scheduled train times with real-time data to identify delays, cancellations, and platform changes.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "train_uid": {
+                        "type": "string",
+                        "description": "Train unique identifier"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format"
+                    },
+                    "real_time_data": {
+                        "type": "object",
+                        "description": "Real-time data from LDBWS API (from get_service_details)"
+                    }
+                },
+                "required": ["train_uid", "travel_date", "real_time_data"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_alternative_route",
+            "description": "Find alternative routes when a train is delayed, cancelled, or full. Suggests next available trains and different connections.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "from_station": {
+                        "type": "string",
+                        "description": "Departure station name or CRS code"
+                    },
+                    "to_station": {
+                        "type": "string",
+                        "description": "Arrival station name or CRS code"
+                    },
+                    "original_train_uid": {
+                        "type": "string",
+                        "description": "UID of the disrupted train"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format"
+                    },
+                    "reason": {
+                        "type": "string",
+                        "description": "Reason for alternative (e.g., 'delayed', 'cancelled', 'full')"
+                    }
+                },
+                "required": ["from_station", "to_station", "travel_date"]
+            }
+        }
+    }
+]
+
 
 class ScotRailAgent:
     """
@@ -120,251 +366,7 @@ class ScotRailAgent:
                 print(f"Warning: Could not initialize timetable tools: {e}")
         self.timetable_tools = timetable_tools
         
-        # Define tools for the agent
-        self.tools = [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_departure_board",
-                    "description": "Fetch basic departure board information for a station. Returns scheduled time, estimated time, destination, platform, and operating company for upcoming trains.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "station_code": {
-                                "type": "string",
-                                "description": "Three-letter CRS station code (e.g., 'EDB' for Edinburgh, 'GLC' for Glasgow Central, 'ABD' for Aberdeen, 'PYL' for Perth)"
-                            },
-                            "num_rows": {
-                                "type": "integer",
-                                "description": "Maximum number of departures to return (default: 10)",
-                                "default": 10
-                            }
-                        },
-                        "required": ["station_code"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_next_departures_with_details",
-                    "description": "Fetch comprehensive departure information with service details including cancellation status, delay reasons, service IDs, and train characteristics. Supports filtering to specific destinations.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "station_code": {
-                                "type": "string",
-                                "description": "Three-letter CRS station code (e.g., 'EDB', 'GLC', 'ABD')"
-                            },
-                            "filter_list": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Optional list of destination CRS codes to filter results. Omit for all departures."
-                            },
-                            "time_offset": {
-                                "type": "integer",
-                                "description": "Minutes from now to start search (default: 0)",
-                                "default": 0
-                            },
-                            "time_window": {
-                                "type": "integer",
-                                "description": "Search window in minutes (default: 120)",
-                                "default": 120
-                            }
-                        },
-                        "required": ["station_code"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_service_details",
-                    "description": "Retrieve detailed information about a specific train service including the complete calling pattern (all stops), real-time status, cancellations, delays, and operator information. Requires a service_id obtained from get_next_departures_with_details.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "service_id": {
-                                "type": "string",
-                                "description": "Unique service identifier obtained from get_next_departures_with_details"
-                            }
-                        },
-                        "required": ["service_id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_station_messages",
-                    "description": "Retrieve service disruption messages and incident information. Returns delays, cancellations, engineering works, and other service disruptions. Can filter by station or return all network-wide incidents.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "station_code": {
-                                "type": "string",
-                                "description": "Optional three-letter CRS code to filter incidents. Omit for network-wide incidents."
-                            }
-                        },
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_current_time",
-                    "description": "Get the current date and time. Use this to understand what time it is now when users ask about trains leaving 'now', 'soon', 'today', or any time-relative questions.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "resolve_station_name",
-                    "description": "Resolve a station name or partial name to its official 3-letter CRS code. Supports fuzzy matching for typos and partial names (e.g., 'edinburgh' → 'EDB', 'glasgow central' → 'GLC'). Use this when users provide station names instead of codes, or when you're unsure of the exact CRS code.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "station_name": {
-                                "type": "string",
-                                "description": "Station name or partial name to search for (e.g., 'edinburgh', 'glasgow central', 'inverness')"
-                            },
-                            "max_results": {
-                                "type": "integer",
-                                "description": "Maximum number of matching stations to return (default: 5)",
-                                "default": 5
-                            }
-                        },
-                        "required": ["station_name"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_scheduled_trains",
-                    "description": "Find scheduled trains between two stations on a specific date. Use this to see all scheduled services, journey times, and plan ahead. Complements real-time data which only shows ~2 hours ahead.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "from_station": {
-                                "type": "string",
-                                "description": "Departure station name or CRS code (e.g., 'Edinburgh' or 'EDB')"
-                            },
-                            "to_station": {
-                                "type": "string",
-                                "description": "Arrival station name or CRS code (e.g., 'Glasgow' or 'GLC')"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format (e.g., '2025-12-01')"
-                            },
-                            "departure_time": {
-                                "type": "string",
-                                "description": "Optional minimum departure time in HH:MM format (e.g., '09:30')"
-                            }
-                        },
-                        "required": ["from_station", "to_station", "travel_date"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "find_journey_route",
-                    "description": "Plan a journey with connections between stations. Finds optimal routes considering interchange times and connection possibilities.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "from_station": {
-                                "type": "string",
-                                "description": "Departure station name or CRS code"
-                            },
-                            "to_station": {
-                                "type": "string",
-                                "description": "Arrival station name or CRS code"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format"
-                            },
-                            "departure_time": {
-                                "type": "string",
-                                "description": "Minimum departure time in HH:MM format"
-                            },
-                            "max_changes": {
-                                "type": "integer",
-                                "description": "Maximum number of connections/changes (default: 2)"
-                            }
-                        },
-                        "required": ["from_station", "to_station", "travel_date"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "compare_schedule_vs_actual",
-                    "description": "Compare scheduled train times with real-time data to identify delays, cancellations, and platform changes.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "train_uid": {
-                                "type": "string",
-                                "description": "Train unique identifier"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format"
-                            },
-                            "real_time_data": {
-                                "type": "object",
-                                "description": "Real-time data from LDBWS API (from get_service_details)"
-                            }
-                        },
-                        "required": ["train_uid", "travel_date", "real_time_data"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "find_alternative_route",
-                    "description": "Find alternative routes when a train is delayed, cancelled, or full. Suggests next available trains and different connections.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "from_station": {
-                                "type": "string",
-                                "description": "Departure station name or CRS code"
-                            },
-                            "to_station": {
-                                "type": "string",
-                                "description": "Arrival station name or CRS code"
-                            },
-                            "original_train_uid": {
-                                "type": "string",
-                                "description": "UID of the disrupted train"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format"
-                            },
-                            "reason": {
-                                "type": "string",
-                                "description": "Reason for alternative (e.g., 'delayed', 'cancelled', 'full')"
-                            }
-                        },
-                        "required": ["from_station", "to_station", "travel_date"]
-                    }
-                }
-            }
-        ]
+        self.tools = TOOLS
         
         # System prompt that defines the agent's personality and role
         self.system_prompt = f"""You are a helpful and humorous AI assistant specializing in ScotRail trains in Scotland.
@@ -527,18 +529,17 @@ Example tone: "Right, let me check the departures from Edinburgh Waverley for ye
         available = self.max_context_tokens - self.max_response_tokens - self.safety_margin
         
         # Log token usage periodically
-        logger.debug(f"Token count: {current_tokens}/{available} "
-                    f"(limit: {self.max_context_tokens}, "
-                    f"response: {self.max_response_tokens}, "
-                    f"safety: {self.safety_margin})")
+        logger.debug("Token count: %d/%d (limit: %d, response: %d, safety: %d)",
+                     current_tokens, available, self.max_context_tokens,
+                     self.max_response_tokens, self.safety_margin)
         
         if current_tokens > available:
-            logger.warning(f"Token limit approaching: {current_tokens}/{available} tokens used")
+            logger.warning("Token limit approaching: %d/%d tokens used", current_tokens, available)
             return True
         
         # Also warn when getting close (80% of available)
         if current_tokens > available * 0.8:
-            logger.info(f"Token usage at 80%: {current_tokens}/{available} tokens")
+            logger.info("Token usage at 80%%: %d/%d tokens", current_tokens, available)
         
         return False
     
@@ -562,7 +563,7 @@ Example tone: "Right, let me check the departures from Edinburgh Waverley for ye
         keep_count = 15
         
         if len(messages) <= keep_count:
-            logger.debug(f"No truncation needed: {len(messages)} messages <= {keep_count}")
+            logger.debug("No truncation needed: %d messages <= %d", len(messages), keep_count)
             return  # Already small enough
         
         # Keep the most recent messages
@@ -572,10 +573,10 @@ Example tone: "Right, let me check the departures from Edinburgh Waverley for ye
         tokens_before = self.count_tokens(self.conversation_history)
         tokens_after = self.count_tokens(truncated)
         
-        logger.info(f"Truncated conversation: removed {removed_count} messages, "
-                   f"kept {len(truncated)} messages. "
-                   f"Tokens: {tokens_before} → {tokens_after} "
-                   f"(saved {tokens_before - tokens_after} tokens)")
+        logger.info("Truncated conversation: removed %d messages, kept %d messages. "
+                    "Tokens: %d → %d (saved %d tokens)",
+                    removed_count, len(truncated), tokens_before, tokens_after,
+                    tokens_before - tokens_after)
         
         self.conversation_history = truncated
     
@@ -591,7 +592,7 @@ Example tone: "Right, let me check the departures from Edinburgh Waverley for ye
             Formatted string with tool results
         """
         try:
-            logger.info(f"Executing tool: {tool_name} with args: {tool_args}")
+            logger.info("Executing tool: %s with args: %s", tool_name, tool_args)
             
             if tool_name == "get_current_time":
                 now = datetime.now()
@@ -872,11 +873,12 @@ Example tone: "Right, let me check the departures from Edinburgh Waverley for ye
                 logger.warning("Token limit approaching, truncating conversation proactively")
                 self._truncate_conversation()
             
-            # Log current token usage
-            current_tokens = self.count_tokens(self.conversation_history)
-            logger.info(f"Chat request - Current tokens: {current_tokens}, "
-                       f"Messages: {len(self.conversation_history)}, "
-                       f"Using {'tiktoken' if TIKTOKEN_AVAILABLE else 'estimation'}")
+            # Log current token usage (counting re-encodes the history, so only when logged)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Chat request - Current tokens: %d, Messages: %d, Using %s",
+                            self.count_tokens(self.conversation_history),
+                            len(self.conversation_history),
+                            'tiktoken' if TIKTOKEN_AVAILABLE else 'estimation')
             
             # Get response from OpenAI with tools
             response = self.client.chat.completions.create(
@@ -15,7 +15,7 @@ import secrets
 from unittest.mock import Mock, patch
 from flask import session
 
-from app import app, agents, session_metadata, get_or_create_agent
+from app import app, agents, get_or_create_agent
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -31,7 +31,6 @@ def reset_app_state():
     except Exception:
         pass
     agents.clear()
-    session_metadata.clear()
     
     yield
     
@@ -43,7 +42,6 @@ def reset_app_state():
     except Exception:
         pass
     agents.clear()
-    session_metadata.clear()
 
 
 @pytest.fixture
@@ -63,7 +61,6 @@ def client():
     
     # Cleanup
     agents.clear()
-    session_metadata.clear()
     limiter.reset()
 
 @pytest.fixture
@@ -107,8 +104,6 @@ def rate_limited_client():
         pass
     
     agents.clear()
-    session_metadata.clear()
-    session_metadata.clear()
 
 
 class TestRoutes:
@@ -137,7 +132,7 @@ class TestRoutes:
         
         with client.session_transaction() as sess:
             assert 'session_id' in sess
-            assert len(sess['session_id']) == 32  # secrets.token_hex(16) = 32 chars
+            assert len(sess['session_id']) == 32  # 16 random bytes, hex encoded
 
 
 class TestAPIEndpoints:
@@ -196,7 +191,8 @@ class TestAPIEndpoints:
                                data='not json',
                                content_type='application/json')
         
-        assert response.status_code in [400, 500]  # Accept either
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid JSON format'
     
     @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
     def test_chat_endpoint_agent_error(self, client):
@@ -268,6 +264,17 @@ class TestAPIEndpoints:
         assert data['status'] == 'healthy'
         assert data['service'] == 'ScotRail Train Travel Advisor'
 
+    def test_chat_response_serializes_unicode(self, client, mock_agent_in_container):
+        """Test chat responses are encoded as UTF-8 JSON by the orjson provider."""
+        mock_agent_in_container.chat.return_value = "Next train: Glasgow → Edinburgh 🚂"
+
+        response = client.post('/api/chat', json={'message': 'Next train?'})
+
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        assert 'Glasgow → Edinburgh 🚂'.encode() in response.data
+        assert response.get_json()['response'] == "Next train: Glasgow → Edinburgh 🚂"
+
 
 class TestSessionManagement:
     """Test session and agent management."""
@@ -305,7 +312,6 @@ class TestSessionManagement:
         from app import get_or_create_agent
         
         agents.clear()
-        session_metadata.clear()
         
         with patch('app.ScotRailAgent', return_value=mock_agent):
             # Session 1
@@ -327,10 +333,9 @@ class TestSessionManagement:
         import app as app_module
         importlib.reload(config_module)
         importlib.reload(app_module)
-        from app import get_or_create_agent, agents, session_metadata
+        from app import get_or_create_agent, agents
         
         agents.clear()
-        session_metadata.clear()
         
         with patch('app.ScotRailAgent', return_value=mock_agent):
             # Create 2 sessions (max limit)
@@ -345,41 +350,68 @@ class TestSessionManagement:
             assert 'session-2' in agents
             assert 'session-3' in agents
     
-    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key', 'SESSION_TTL_HOURS': '0'})
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
     def test_expired_sessions_cleanup(self, mock_agent):
-        """Test that expired sessions are cleaned up."""
-        # Need to reload modules to pick up new env vars
-        import importlib
-        import config as config_module
-        import app as app_module
-        importlib.reload(config_module)
-        importlib.reload(app_module)
-        from app import get_or_create_agent, agents, session_metadata, _cleanup_expired_sessions
-        from datetime import datetime, timedelta
-        
-        agents.clear()
-        session_metadata.clear()
+        """Test that the background sweep removes expired sessions only."""
+        # Import after earlier tests may have reloaded the app module
+        from app import agents, agents_lock, _cleanup_expired_sessions, SESSION_TTL_SECONDS
+        import time
         
         with patch('app.ScotRailAgent', return_value=mock_agent):
-            # Create a session
-            agent1, _ = get_or_create_agent('session-1')
-            assert 'session-1' in agents
+            get_or_create_agent('session-1')
+            get_or_create_agent('session-2')
             
             # Manually set session to be expired (older than TTL)
-            session_metadata['session-1'] = datetime.now() - timedelta(hours=1)
+            agents['session-1'].last_access = time.monotonic() - SESSION_TTL_SECONDS - 1
             
-            # Create another session - should trigger cleanup
-            agent2, _ = get_or_create_agent('session-2')
+            # One pass of the background cleanup loop
+            with agents_lock:
+                _cleanup_expired_sessions()
             
             # session-1 should be cleaned up
             assert 'session-1' not in agents
             assert 'session-2' in agents
     
+    def test_warm_pool_skips_stale_agents(self, monkeypatch):
+        """Test pooled agents past their max age are discarded, fresh ones reused."""
+        import time
+        import app as app_module
+        
+        monkeypatch.setattr(app_module.config, 'agent_pool_size', 1)
+        stale, fresh = Mock(), Mock()
+        
+        app_module._agent_pool.put((time.monotonic() - app_module.AGENT_POOL_MAX_AGE_SECONDS, stale))
+        assert app_module._take_pooled_agent() is None
+        
+        app_module._agent_pool.put((time.monotonic(), fresh))
+        assert app_module._take_pooled_agent() is fresh
+        app_module._agent_pool_refill.clear()
+    
+    def test_warm_pool_replaces_aging_agents(self):
+        """Test a refill pass swaps out agents past half their max age, keeps fresh ones."""
+        import time
+        import app as app_module
+        
+        aging, fresh, rebuilt = Mock(), Mock(), Mock()
+        container = Mock()
+        container.create_agent.return_value = rebuilt
+        
+        with patch('app.get_container', return_value=container):
+            app_module._agent_pool.put((time.monotonic(), fresh))
+            app_module._top_up_agent_pool()
+            assert container.create_agent.call_count == 0
+            assert app_module._agent_pool.get_nowait()[1] is fresh
+            
+            half_age = app_module.AGENT_POOL_MAX_AGE_SECONDS / 2
+            app_module._agent_pool.put((time.monotonic() - half_age - 1, aging))
+            app_module._top_up_agent_pool()
+            assert container.create_agent.call_count == 1
+            assert app_module._agent_pool.get_nowait()[1] is rebuilt
+    
     @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
     def test_session_access_updates_timestamp(self, mock_agent):
         """Test that accessing a session returns the same agent instance."""
         agents.clear()
-        session_metadata.clear()
         
         with patch('app.ScotRailAgent', return_value=mock_agent):
             # Create a session
@@ -392,6 +424,16 @@ class TestSessionManagement:
             assert agent1 == agent2
             assert agent1 is agent2
 
+    def test_new_session_ids_are_unique_across_batches(self):
+        """Test batched session IDs stay unique when the pool is refilled."""
+        from app import _new_session_id, SESSION_ID_BATCH
+
+        ids = [_new_session_id() for _ in range(SESSION_ID_BATCH * 2 + 1)]
+
+        assert len(set(ids)) == len(ids)
+        assert all(len(sid) == 32 for sid in ids)
+        int(ids[0], 16)  # hex encoded
+
 
 class TestInputValidation:
     """Test input validation and sanitization."""
@@ -411,6 +453,19 @@ class TestInputValidation:
         assert 'error' in data
         assert 'too long' in data['error'].lower()
     
+    def test_chat_rejects_oversized_body(self, client):
+        """Test chat API rejects bodies over MAX_CONTENT_LENGTH before parsing."""
+        from app import config
+        
+        with client.session_transaction() as sess:
+            sess['session_id'] = 'test-session-123'
+        
+        body = '{"message": "' + 'a' * config.max_content_length + '"}'
+        response = client.post('/api/chat', data=body, content_type='application/json')
+        
+        assert response.status_code == 413
+        assert 'error' in response.get_json()
+    
     def test_chat_rejects_empty_message(self, client):
         """Test chat API rejects empty messages."""
         with client.session_transaction() as sess:
@@ -477,6 +532,23 @@ class TestInputValidation:
         data = response.get_json()
         assert 'error' in data
     
+    def test_chat_rejects_mixed_case_patterns(self, client):
+        """Test suspicious pattern matching ignores case."""
+        with client.session_transaction() as sess:
+            sess['session_id'] = 'test-session-123'
+        
+        for message in ['Hi <SCRIPT>alert(1)</SCRIPT>', '<body OnLoad=alert(1)>']:
+            response = client.post('/api/chat', json={'message': message})
+            assert response.status_code == 400
+    
+    def test_chat_rejects_event_handlers_with_spacing(self, client):
+        """Test event handler matching tolerates whitespace before '='."""
+        with client.session_transaction() as sess:
+            sess['session_id'] = 'test-session-123'
+        
+        response = client.post('/api/chat', json={'message': '<img src=x onerror = alert(1)>'})
+        assert response.status_code == 400
+    
     def test_chat_rejects_non_json_content(self, client):
         """Test chat API rejects non-JSON content."""
         with client.session_transaction() as sess:
@@ -605,7 +677,6 @@ class TestConcurrency:
         """Test multiple sessions can coexist."""
         from app import agents as app_agents
         app_agents.clear()
-        session_metadata.clear()
         
         client1 = app.test_client()
         client2 = app.test_client()
@@ -626,6 +697,56 @@ class TestConcurrency:
         # Verify sessions were handled (may not create agents if rate limited)
         if resp1.status_code == 200 or resp2.status_code == 200:
             assert len(app_agents) >= 0  # At least one might be created
+    
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
+    def test_busy_session_returns_429(self, client, mock_agent_in_container):
+        """Test a second in-flight chat for the same session is rejected."""
+        from app import _acquire_chat_slot, _release_chat_slot
+        
+        with client.session_transaction() as sess:
+            sess['session_id'] = 'busy-session'
+        
+        assert _acquire_chat_slot('busy-session')
+        try:
+            response = client.post('/api/chat', json={'message': 'Hello'})
+        finally:
+            _release_chat_slot('busy-session')
+        
+        assert response.status_code == 429
+        assert response.get_json()['code'] == 'agent.rate_limited'
+        assert 'Retry-After' in response.headers
+        mock_agent_in_container.chat.assert_not_called()
+        
+        response = client.post('/api/chat', json={'message': 'Hello'})
+        assert response.status_code == 200
+    
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
+    def test_concurrent_first_requests_create_one_agent(self, mock_agent):
+        """Test simultaneous first requests for a session share one agent."""
+        import threading
+        import time
+        
+        created = []
+        
+        def slow_agent(*args, **kwargs):
+            time.sleep(0.05)
+            agent = Mock()
+            created.append(agent)
+            return agent
+        
+        results = []
+        with patch('app.ScotRailAgent', side_effect=slow_agent):
+            threads = [
+                threading.Thread(target=lambda: results.append(get_or_create_agent('shared-session')))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        
+        assert len(created) == 1
+        assert all(agent is created[0] and error is None for agent, error in results)
 
 
 class TestZRateLimiting:
@@ -653,26 +774,44 @@ class TestZRateLimiting:
         # Due to test suite accumulation, we might hit rate limit immediately
         # Just verify rate limiting is working (some responses should be 429)
         assert len(rate_limited) > 0 or len(successful) > 0, "Expected some responses (200 or 429)"
-    
+        
+        for response in rate_limited:
+            assert response.get_json()['code'] == 'agent.rate_limited'
+            assert 1 <= int(response.headers['Retry-After']) <= 60
+
     @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
-    def test_rate_limit_health_endpoint(self, rate_limited_client):
-        """Test rate limiting on health endpoint."""
+    def test_retry_after_only_on_rejections(self, rate_limited_client, mock_agent_in_container):
+        """Test the limiter leaves 200s and the busy-session Retry-After alone."""
+        from app import _acquire_chat_slot, _release_chat_slot, CHAT_BUSY_RETRY_AFTER_SECONDS
+
+        with rate_limited_client.session_transaction() as sess:
+            sess['session_id'] = 'retry-after-session'
+
+        response = rate_limited_client.post('/api/chat', json={'message': 'Hello'})
+        assert response.status_code == 200
+        assert 'Retry-After' not in response.headers
+
+        assert _acquire_chat_slot('retry-after-session')
+        try:
+            response = rate_limited_client.post('/api/chat', json={'message': 'Hello'})
+        finally:
+            _release_chat_slot('retry-after-session')
+
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == str(CHAT_BUSY_RETRY_AFTER_SECONDS)
+
+    @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
+    def test_health_endpoint_not_rate_limited(self, rate_limited_client):
+        """Test health probes bypass rate limiting."""
         # Verify rate limiting is configured (not disabled in test mode)
         from app import limiter
         assert limiter.enabled == True, "Limiter should be enabled"
         
-        # Make a few requests to verify endpoint works
-        responses = []
-        for i in range(5):
-            response = rate_limited_client.get('/api/health')
-            responses.append(response)
+        # Well past any per-minute limit
+        responses = [rate_limited_client.get('/api/health') for _ in range(100)]
         
-        # All should succeed as we're under the limit
         successful = [r for r in responses if r.status_code == 200]
-        assert len(successful) == 5, f"Expected all 5 successful, got {len(successful)}"
-        
-        # Verify limiter is tracking requests (storage is not empty after requests)
-        # Note: In-memory storage behavior varies by Flask-Limiter version
+        assert len(successful) == 100, f"Expected all 100 successful, got {len(successful)}"
     
     @patch.dict('os.environ', {'OPENAI_API_KEY': 'test-api-key'})
     def test_rate_limit_headers_present(self, rate_limited_client):
@@ -48,6 +48,14 @@ class TestTimetableDatabaseSchema:
             assert 'station_connections' in tables
             assert 'metadata' in tables
             
+            # Readers run alongside writers
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == 'wal'
+            cursor.execute("PRAGMA cache_size")
+            assert cursor.fetchone()[0] == -32000
+            cursor.execute("PRAGMA busy_timeout")
+            assert cursor.fetchone()[0] == 5000
+            
             db.close()
         finally:
             if os.path.exists(db_path):
@@ -156,6 +164,12 @@ class TestTimetableDatabaseSchema:
             assert results[0]['arrival_time'] == '10:00'
             assert results[0]['duration_minutes'] == 60
             
+            # Validity dates are inclusive at both ends
+            assert len(db.find_trains_between_stations('EDINBUR', 'GLASGOW', date(2025, 12, 1))) == 1
+            assert len(db.find_trains_between_stations('EDINBUR', 'GLASGOW', date(2025, 12, 31))) == 1
+            assert db.find_trains_between_stations('EDINBUR', 'GLASGOW', date(2025, 11, 30)) == []
+            assert db.find_trains_between_stations('EDINBUR', 'GLASGOW', date(2026, 1, 1)) == []
+            
             db.close()
         finally:
             if os.path.exists(db_path):
@@ -301,6 +315,36 @@ class TestTimetableTools:
         
         tools.close()
     
+    def test_queries_from_other_threads(self, mock_db):
+        """Test tools built on one thread can query from request threads."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        tools = TimetableTools(db_path=mock_db)
+        
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(
+                lambda _: tools.get_scheduled_trains('EDINBUR', 'GLASGOW', '2025-12-15'),
+                range(8)
+            ))
+        
+        assert all(r['success'] and r['count'] == 1 for r in results)
+        
+        tools.close()
+    
+    def test_resolve_station_is_memoized(self, mock_db):
+        """Test repeated station lookups skip the fuzzy search."""
+        tools = TimetableTools(db_path=mock_db)
+        tools.station_resolver = Mock()
+        tools.station_resolver.get_by_crs.return_value = None
+        tools.station_resolver.search.return_value = [(Mock(tiploc='EDINBUR'), 90)]
+        
+        assert tools._resolve_station('Edinburgh') == 'EDINBUR'
+        assert tools._resolve_station('Edinburgh') == 'EDINBUR'
+        
+        tools.station_resolver.search.assert_called_once_with('Edinburgh', limit=1)
+        
+        tools.close()
+    
     def test_get_tool_schemas(self):
         """Test tool schemas are properly formatted for OpenAI."""
         tools = TimetableTools()
@@ -556,7 +556,7 @@ class TestIntegration:
 class TestGetStationMessages:
     """Tests for the get_station_messages REST disruptions method."""
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_station_messages_success_list_payload(self, mock_get):
         # Mock XML response from the actual API
         xml_payload = '''<?xml version="1.0" encoding="utf-8"?>
@@ -625,7 +625,7 @@ class TestGetStationMessages:
         assert args[0].endswith('incidents.xml')
         assert kwargs['headers']['x-apikey'] == 'test-key'
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_station_messages_success_dict_messages(self, mock_get):
         # Mock XML with operator and routes information
         xml_payload = '''<?xml version="1.0" encoding="utf-8"?>
@@ -690,7 +690,7 @@ class TestGetStationMessages:
         assert isinstance(res, train_tools.StationMessagesError)
         assert 'Missing API key' in res.error
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_station_messages_http_error(self, mock_get):
         # Simulate HTTP error with status code
         mock_resp = MagicMock()
@@ -705,7 +705,7 @@ class TestGetStationMessages:
         assert 'HTTP 403' in res.error
         assert 'Incidents feed request failed' in res.message
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_station_messages_timeout(self, mock_get):
         mock_get.side_effect = requests.Timeout('request timed out')
 
@@ -716,3 +716,168 @@ class TestGetStationMessages:
         assert isinstance(res, train_tools.StationMessagesError)
         assert 'request timed out' in res.error
         assert 'Unable to fetch station messages' in res.message
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_reuses_cached_feed(self, mock_get):
+        mock_resp = MagicMock()
+        mock_resp.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        mock_resp.raise_for_status.return_value = None
+        mock_get.return_value = mock_resp
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        tools.get_station_messages()
+        res = tools.get_station_messages('EDB')
+
+        assert isinstance(res, train_tools.StationMessagesResponse)
+        assert mock_get.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_parses_feed_once(self, mock_get):
+        mock_resp = MagicMock()
+        mock_resp.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        mock_resp.raise_for_status.return_value = None
+        mock_get.return_value = mock_resp
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        with patch.object(tools, '_parse_incidents', wraps=tools._parse_incidents) as spy:
+            tools.get_station_messages('edb')
+            tools.get_station_messages('EDB')
+            tools.get_station_messages('GLC')
+            tools.get_station_messages()
+
+        assert spy.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_filters_by_routes(self, mock_get):
+        mock_resp = MagicMock()
+        mock_resp.text = '''<Incidents xmlns="http://nationalrail.co.uk/xml/incident">
+  <PtIncident><IncidentNumber>a</IncidentNumber><Affects><RoutesAffected>Edinburgh (EDB) to Glasgow</RoutesAffected></Affects></PtIncident>
+  <PtIncident><IncidentNumber>b</IncidentNumber><Affects><RoutesAffected>Perth to Dundee</RoutesAffected></Affects></PtIncident>
+  <PtIncident><IncidentNumber>c</IncidentNumber></PtIncident>
+</Incidents>'''
+        mock_resp.raise_for_status.return_value = None
+        mock_get.return_value = mock_resp
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+
+        assert [m.id for m in tools.get_station_messages('edb').messages] == ['a', 'c']
+        assert [m.id for m in tools.get_station_messages().messages] == ['a', 'b', 'c']
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_revalidates_with_etag(self, mock_get):
+        first = MagicMock()
+        first.status_code = 200
+        first.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        first.headers = {'ETag': '"v1"'}
+        not_modified = MagicMock()
+        not_modified.status_code = 304
+        not_modified.text = ''
+        not_modified.headers = {}
+        mock_get.side_effect = [first, not_modified]
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        tools.incidents_cache_ttl = 0
+        with patch.object(tools, '_parse_incidents', wraps=tools._parse_incidents) as spy:
+            tools.get_station_messages()
+            res = tools.get_station_messages()
+            tools._incidents_refresher.join()
+
+        assert isinstance(res, train_tools.StationMessagesResponse)
+        assert mock_get.call_args_list[1].kwargs['headers']['If-None-Match'] == '"v1"'
+        assert spy.call_count == 1
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_refreshes_stale_feed_in_background(self, mock_get):
+        old_resp = MagicMock()
+        old_resp.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        old_resp.headers = {}
+        new_resp = MagicMock()
+        new_resp.text = '''<Incidents xmlns="http://nationalrail.co.uk/xml/incident">
+  <PtIncident><IncidentNumber>n1</IncidentNumber></PtIncident>
+</Incidents>'''
+        new_resp.headers = {}
+        mock_get.side_effect = [old_resp, new_resp]
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        tools.get_station_messages()
+        tools.incidents_cache_ttl = 0
+
+        # The stale copy is served while the refresh runs
+        assert tools.get_station_messages().messages == []
+        tools._incidents_refresher.join()
+        tools.incidents_cache_ttl = 60
+        assert [m.id for m in tools.get_station_messages().messages] == ['n1']
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_serves_stale_feed_on_error(self, mock_get):
+        mock_resp = MagicMock()
+        mock_resp.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        mock_resp.raise_for_status.return_value = None
+        mock_get.return_value = mock_resp
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        tools.incidents_cache_ttl = 0
+        tools.get_station_messages()
+
+        mock_get.side_effect = requests.Timeout('request timed out')
+        res = tools.get_station_messages()
+        tools._incidents_refresher.join()
+
+        assert isinstance(res, train_tools.StationMessagesResponse)
+        assert mock_get.call_count == 2
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_backs_off_after_failed_refresh(self, mock_get):
+        mock_resp = MagicMock()
+        mock_resp.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        mock_resp.raise_for_status.return_value = None
+        mock_get.return_value = mock_resp
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        tools.incidents_cache_ttl = 0
+        tools.get_station_messages()
+
+        mock_get.side_effect = requests.Timeout('request timed out')
+        tools.get_station_messages()
+        tools._incidents_refresher.join()
+        # Within the backoff window the cached copy is served without a new fetch
+        res = tools.get_station_messages()
+
+        assert isinstance(res, train_tools.StationMessagesResponse)
+        assert mock_get.call_count == 2
+
+    @patch('requests.Session.get')
+    def test_get_station_messages_refetches_feed_past_max_staleness(self, mock_get):
+        old_resp = MagicMock()
+        old_resp.text = '<Incidents xmlns="http://nationalrail.co.uk/xml/incident"/>'
+        old_resp.headers = {}
+        new_resp = MagicMock()
+        new_resp.text = '''<Incidents xmlns="http://nationalrail.co.uk/xml/incident">
+  <PtIncident><IncidentNumber>n1</IncidentNumber></PtIncident>
+</Incidents>'''
+        new_resp.headers = {}
+        mock_get.side_effect = [old_resp, new_resp, requests.Timeout('request timed out')]
+
+        tools = train_tools.TrainTools()
+        tools.disruptions_api_key = 'test-key'
+        tools.get_station_messages()
+        checked_at, fetched_at, xml_text = tools._incidents_cache
+        too_old = checked_at - tools.incidents_max_stale
+        tools._incidents_cache = (too_old, fetched_at, xml_text)
+
+        # Too old to serve: the refresh happens inline, not in the background
+        assert [m.id for m in tools.get_station_messages().messages] == ['n1']
+        assert tools._incidents_refresher is None
+
+        tools._incidents_cache = (too_old, *tools._incidents_cache[1:])
+        res = tools.get_station_messages()
+
+        assert isinstance(res, train_tools.StationMessagesError)
+        assert mock_get.call_count == 3
@@ -9,6 +9,7 @@ Tests cover:
 - Edge cases and error conditions
 """
 
+import json
 import pytest
 import requests
 from unittest.mock import Mock, patch, MagicMock, PropertyMock
@@ -29,7 +30,7 @@ from train_tools import (
 class TestServiceDetails:
     """Tests for get_service_details method."""
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_success(self, mock_get):
         """Test successful service details retrieval."""
         mock_response = {
@@ -60,7 +61,7 @@ class TestServiceDetails:
         }
         
         mock_resp = MagicMock()
-        mock_resp.json.return_value = mock_response
+        mock_resp.content = json.dumps(mock_response).encode()
         mock_resp.raise_for_status.return_value = None
         mock_get.return_value = mock_resp
         
@@ -77,7 +78,7 @@ class TestServiceDetails:
         assert result.calling_points[0].location_name == 'Birmingham'
         assert result.calling_points[0].length == '8'  # Converted to string
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_with_cancelled_service(self, mock_get):
         """Test service details for cancelled service."""
         mock_response = {
@@ -89,7 +90,7 @@ class TestServiceDetails:
         }
         
         mock_resp = MagicMock()
-        mock_resp.json.return_value = mock_response
+        mock_resp.content = json.dumps(mock_response).encode()
         mock_resp.raise_for_status.return_value = None
         mock_get.return_value = mock_resp
         
@@ -100,7 +101,7 @@ class TestServiceDetails:
         assert result.is_cancelled is True
         assert result.cancel_reason == 'Staff shortage'
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_with_delay(self, mock_get):
         """Test service details for delayed service."""
         mock_response = {
@@ -111,7 +112,7 @@ class TestServiceDetails:
         }
         
         mock_resp = MagicMock()
-        mock_resp.json.return_value = mock_response
+        mock_resp.content = json.dumps(mock_response).encode()
         mock_resp.raise_for_status.return_value = None
         mock_get.return_value = mock_resp
         
@@ -121,7 +122,7 @@ class TestServiceDetails:
         assert isinstance(result, ServiceDetailsResponse)
         assert result.delay_reason == 'Signal failure'
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_http_error(self, mock_get):
         """Test HTTP error handling."""
         mock_resp = MagicMock()
@@ -135,7 +136,7 @@ class TestServiceDetails:
         assert isinstance(result, ServiceDetailsError)
         assert 'HTTP 404' in result.error
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_network_error(self, mock_get):
         """Test network error handling."""
         mock_get.side_effect = requests.RequestException('Network error')
@@ -146,11 +147,11 @@ class TestServiceDetails:
         assert isinstance(result, ServiceDetailsError)
         assert 'Network error' in result.error
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_json_parse_error(self, mock_get):
         """Test JSON parsing error handling."""
         mock_resp = MagicMock()
-        mock_resp.json.side_effect = ValueError('Invalid JSON')
+        mock_resp.content = b'not json'
         mock_resp.raise_for_status.return_value = None
         mock_get.return_value = mock_resp
         
@@ -160,7 +161,7 @@ class TestServiceDetails:
         assert isinstance(result, ServiceDetailsError)
         assert 'Error parsing service details' in result.message
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_with_nested_result(self, mock_get):
         """Test service details with GetServiceDetailsResult wrapper."""
         mock_response = {
@@ -173,7 +174,7 @@ class TestServiceDetails:
         }
         
         mock_resp = MagicMock()
-        mock_resp.json.return_value = mock_response
+        mock_resp.content = json.dumps(mock_response).encode()
         mock_resp.raise_for_status.return_value = None
         mock_get.return_value = mock_resp
         
@@ -183,7 +184,7 @@ class TestServiceDetails:
         assert isinstance(result, ServiceDetailsResponse)
         assert result.operator == 'Test Operator'
     
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_service_details_with_zero_length(self, mock_get):
         """Test handling of zero length (edge case that caused original bug)."""
         mock_response = {
@@ -204,7 +205,7 @@ class TestServiceDetails:
         }
         
         mock_resp = MagicMock()
-        mock_resp.json.return_value = mock_response
+        mock_resp.content = json.dumps(mock_response).encode()
         mock_resp.raise_for_status.return_value = None
         mock_get.return_value = mock_resp
         
@@ -649,6 +650,14 @@ class TestInitialization:
         assert tools.ldb_token == 'test_ldb'
         assert tools.wsdl == 'http://test.wsdl'
     
+    def test_http_session_retries_connect_only(self):
+        """Read timeouts and error statuses are not retried."""
+        tools = TrainTools(ldb_token='test_ldb', wsdl='http://test.wsdl')
+        retry = tools._http.get_adapter('https://example.com').max_retries
+        assert retry.connect == 1
+        assert retry.read == 0
+        assert retry.status == 0
+    
     @patch.dict('os.environ', {'LDB_TOKEN': 'env_token'})
     def test_init_with_env_vars(self):
         """Test initialization falls back to environment variables."""
@@ -14,7 +14,9 @@ The database enables:
 - Finding alternative routes when disruptions occur
 """
 
+import queue
 import sqlite3
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, date, time, timedelta
@@ -23,8 +25,50 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Read connections kept open per database. Agents are used from whichever
+# request thread serves the session, so queries borrow a connection from
+# this pool rather than sharing (or reopening) one per call.
+READ_POOL_SIZE = 4
 
-@dataclass
+# Page cache per connection, in KiB. The container shares one database (and
+# so one pool) per process, bounding the total at (READ_POOL_SIZE + 1) caches.
+CACHE_SIZE_KIB = 32000
+# How long (ms) a connection waits on a locked database before failing
+BUSY_TIMEOUT_MS = 5000
+
+# Direct trains between two stations on a date. Kept as fixed statement text
+# (one variant per optional filter) so sqlite3's per-connection statement
+# cache reuses the prepared statement; column order matches the row unpacking
+# in find_trains_between_stations.
+_TRAINS_BETWEEN_SELECT = """
+    SELECT 
+        s.train_uid,
+        s.train_headcode,
+        s.operator_code,
+        s.train_class,
+        s.reservations,
+        s.catering,
+        dep.departure_time,
+        arr.arrival_time,
+        dep.platform,
+        arr.platform
+    FROM schedules s
+    JOIN schedule_locations dep ON s.schedule_id = dep.schedule_id
+    JOIN schedule_locations arr ON s.schedule_id = arr.schedule_id
+    WHERE dep.tiploc = ?
+      AND arr.tiploc = ?
+      AND dep.sequence < arr.sequence
+      AND s.start_date <= ?  -- ISO dates compare correctly as text
+      AND s.end_date >= ?
+      AND substr(s.days_run, ? + 1, 1) = '1'
+"""
+_TRAINS_BETWEEN_SQL = _TRAINS_BETWEEN_SELECT + " ORDER BY dep.departure_time"
+_TRAINS_BETWEEN_FROM_TIME_SQL = (
+    _TRAINS_BETWEEN_SELECT + " AND dep.departure_time >= ? ORDER BY dep.departure_time"
+)
+
+
+@dataclass(slots=True)
 class ScheduledTrain:
     """Represents a scheduled train service."""
     schedule_id: int
@@ -46,7 +90,7 @@ class ScheduledTrain:
     catering: Optional[str] = None  # Catering codes
 
 
-@dataclass
+@dataclass(slots=True)
 class ScheduleLocation:
     """Represents a stop/passing point in a train schedule."""
     location_id: int
@@ -68,7 +112,7 @@ class ScheduleLocation:
     activities: Optional[str] = None  # e.g., "TB" = train begins, "TF" = train finishes
 
 
-@dataclass
+@dataclass(slots=True)
 class StationConnection:
     """Represents a connection/interchange between stations or platforms."""
     connection_id: int
@@ -89,31 +133,69 @@ class TimetableDatabase:
     - Integration with real-time departure data
     """
     
-    def __init__(self, db_path: str = "timetable.db"):
+    def __init__(self, db_path: str = "timetable.db", read_pool_size: int = READ_POOL_SIZE):
         """
         Initialize database connection and create schema if needed.
         
         Args:
             db_path: Path to SQLite database file (created if doesn't exist)
+            read_pool_size: Maximum idle read connections kept open
         """
         self.db_path = db_path
         self.conn: Optional[sqlite3.Connection] = None
-        logger.info(f"Initializing timetable database: {db_path}")
+        self._read_pool: queue.LifoQueue = queue.LifoQueue(maxsize=read_pool_size)
+        logger.info("Initializing timetable database: %s", db_path)
+        
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection usable from any thread (each is used by one thread at a time)."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable column access by name
+        # WAL (set in connect) only needs a sync at checkpoints, not every commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KIB}")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
         
     def connect(self):
         """Open database connection and create schema if needed."""
-        self.conn = sqlite3.connect(self.db_path)
-        self.conn.row_factory = sqlite3.Row  # Enable column access by name
+        self.conn = self._open_connection()
+        # Persistent on the file: pooled readers no longer block on, or are
+        # blocked by, a writer loading schedules
+        self.conn.execute("PRAGMA journal_mode=WAL")
         self._create_schema()
         logger.info("Database connected and schema initialized")
         
     def close(self):
         """Close database connection."""
+        while True:
+            try:
+                self._read_pool.get_nowait().close()
+            except queue.Empty:
+                break
         if self.conn:
             self.conn.close()
             self.conn = None
             logger.info("Database connection closed")
             
+    @contextmanager
+    def _reader(self):
+        """Borrow a read connection from the pool, opening one if none is idle."""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = self._open_connection()
+        try:
+            yield conn
+        finally:
+            if self.conn is None:
+                conn.close()  # database was closed while this query ran
+            else:
+                try:
+                    self._read_pool.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+            
     def _create_schema(self):
         """
         Create database schema for timetable data.
@@ -266,24 +348,26 @@ class TimetableDatabase:
         
         schedule_id = cursor.lastrowid
         
-        # Insert all locations
-        for loc in locations:
-            cursor.execute("""
-                INSERT INTO schedule_locations (
-                    schedule_id, sequence, tiploc, location_type,
-                    arrival_time, departure_time, pass_time,
-                    platform, activities
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        # Insert all locations in one statement
+        cursor.executemany("""
+            INSERT INTO schedule_locations (
+                schedule_id, sequence, tiploc, location_type,
+                arrival_time, departure_time, pass_time,
+                platform, activities
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [
+            (
                 schedule_id, loc.sequence, loc.tiploc, loc.location_type,
                 loc.arrival_time.strftime("%H:%M") if loc.arrival_time else None,
                 loc.departure_time.strftime("%H:%M") if loc.departure_time else None,
                 loc.pass_time.strftime("%H:%M") if loc.pass_time else None,
                 loc.platform, loc.activities
-            ))
+            )
+            for loc in locations
+        ])
         
         self.conn.commit()
-        logger.debug(f"Inserted schedule {train.train_uid} with {len(locations)} locations")
+        logger.debug("Inserted schedule %s with %d locations", train.train_uid, len(locations))
         return schedule_id
         
     def find_trains_between_stations(
@@ -305,65 +389,39 @@ class TimetableDatabase:
         Returns:
             List of train services with departure/arrival times
         """
-        cursor = self.conn.cursor()
-        
         # Convert date to day of week (0=Monday, 6=Sunday)
         day_index = travel_date.weekday()
         
-        # Build query
-        query = """
-            SELECT 
-                s.train_uid,
-                s.train_headcode,
-                s.operator_code,
-                s.train_class,
-                s.reservations,
-                s.catering,
-                dep.departure_time as dep_time,
-                arr.arrival_time as arr_time,
-                dep.platform as dep_platform,
-                arr.platform as arr_platform,
-                dep.sequence as dep_seq,
-                arr.sequence as arr_seq
-            FROM schedules s
-            JOIN schedule_locations dep ON s.schedule_id = dep.schedule_id
-            JOIN schedule_locations arr ON s.schedule_id = arr.schedule_id
-            WHERE dep.tiploc = ?
-              AND arr.tiploc = ?
-              AND dep.sequence < arr.sequence
-              AND date(s.start_date) <= date(?)
-              AND date(s.end_date) >= date(?)
-              AND substr(s.days_run, ? + 1, 1) = '1'
-        """
-        
         params = [from_tiploc, to_tiploc, travel_date.isoformat(), 
                  travel_date.isoformat(), day_index]
         
         if departure_time:
-            query += " AND dep.departure_time >= ?"
+            query = _TRAINS_BETWEEN_FROM_TIME_SQL
             params.append(departure_time.strftime("%H:%M"))
-            
-        query += " ORDER BY dep.departure_time"
+        else:
+            query = _TRAINS_BETWEEN_SQL
         
-        cursor.execute(query, params)
+        with self._reader() as conn:
+            rows = conn.execute(query, params).fetchall()
         
         results = []
-        for row in cursor.fetchall():
+        for (train_uid, headcode, operator, train_class, reservations, catering,
+             dep_time, arr_time, dep_platform, arr_platform) in rows:
             results.append({
-                'train_uid': row['train_uid'],
-                'headcode': row['train_headcode'],
-                'operator': row['operator_code'],
-                'class': row['train_class'],
-                'reservations': row['reservations'],
-                'catering': row['catering'],
-                'departure_time': row['dep_time'],
-                'arrival_time': row['arr_time'],
-                'departure_platform': row['dep_platform'],
-                'arrival_platform': row['arr_platform'],
-                'duration_minutes': self._calculate_duration(row['dep_time'], row['arr_time'])
+                'train_uid': train_uid,
+                'headcode': headcode,
+                'operator': operator,
+                'class': train_class,
+                'reservations': reservations,
+                'catering': catering,
+                'departure_time': dep_time,
+                'arrival_time': arr_time,
+                'departure_platform': dep_platform,
+                'arrival_platform': arr_platform,
+                'duration_minutes': self._calculate_duration(dep_time, arr_time)
             })
             
-        logger.info(f"Found {len(results)} trains from {from_tiploc} to {to_tiploc} on {travel_date}")
+        logger.info("Found %d trains from %s to %s on %s", len(results), from_tiploc, to_tiploc, travel_date)
         return results
         
     def _calculate_duration(self, dep_time: str, arr_time: str) -> int:
@@ -401,40 +459,39 @@ class TimetableDatabase:
         Returns:
             List of stops in sequence with timing information
         """
-        cursor = self.conn.cursor()
-        
         day_index = travel_date.weekday()
         
-        cursor.execute("""
-            SELECT 
-                loc.tiploc,
-                loc.location_type,
-                loc.arrival_time,
-                loc.departure_time,
-                loc.pass_time,
-                loc.platform,
-                loc.activities,
-                loc.sequence
-            FROM schedules s
-            JOIN schedule_locations loc ON s.schedule_id = loc.schedule_id
-            WHERE s.train_uid = ?
-              AND date(s.start_date) <= date(?)
-              AND date(s.end_date) >= date(?)
-              AND substr(s.days_run, ? + 1, 1) = '1'
-            ORDER BY loc.sequence
-        """, (train_uid, travel_date.isoformat(), travel_date.isoformat(), day_index))
+        with self._reader() as conn:
+            rows = conn.execute("""
+                SELECT 
+                    loc.tiploc,
+                    loc.location_type,
+                    loc.arrival_time,
+                    loc.departure_time,
+                    loc.pass_time,
+                    loc.platform,
+                    loc.activities,
+                    loc.sequence
+                FROM schedules s
+                JOIN schedule_locations loc ON s.schedule_id = loc.schedule_id
+                WHERE s.train_uid = ?
+                  AND s.start_date <= ?
+                  AND s.end_date >= ?
+                  AND substr(s.days_run, ? + 1, 1) = '1'
+                ORDER BY loc.sequence
+            """, (train_uid, travel_date.isoformat(), travel_date.isoformat(), day_index)).fetchall()
         
         results = []
-        for row in cursor.fetchall():
+        for tiploc, location_type, arrival, departure, pass_time, platform, activities, sequence in rows:
             results.append({
-                'tiploc': row['tiploc'],
-                'type': row['location_type'],
-                'arrival': row['arrival_time'],
-                'departure': row['departure_time'],
-                'pass': row['pass_time'],
-                'platform': row['platform'],
-                'activities': row['activities'],
-                'sequence': row['sequence']
+                'tiploc': tiploc,
+                'type': location_type,
+                'arrival': arrival,
+                'departure': departure,
+                'pass': pass_time,
+                'platform': platform,
+                'activities': activities,
+                'sequence': sequence
             })
             
         return results
@@ -469,13 +526,12 @@ class TimetableDatabase:
         Returns:
             List of available connections
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            SELECT connection_id, from_station, to_station, connection_type, duration_minutes
-            FROM station_connections
-            WHERE from_station = ?
-        """, (tiploc,))
+        with self._reader() as conn:
+            rows = conn.execute("""
+                SELECT connection_id, from_station, to_station, connection_type, duration_minutes
+                FROM station_connections
+                WHERE from_station = ?
+            """, (tiploc,)).fetchall()
         
         return [
             StationConnection(
@@ -485,21 +541,15 @@ class TimetableDatabase:
                 connection_type=row['connection_type'],
                 duration_minutes=row['duration_minutes']
             )
-            for row in cursor.fetchall()
+            for row in rows
         ]
         
     def get_statistics(self) -> Dict[str, int]:
         """Get database statistics (number of schedules, locations, etc.)."""
-        cursor = self.conn.cursor()
-        
-        cursor.execute("SELECT COUNT(*) as count FROM schedules")
-        schedule_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM schedule_locations")
-        location_count = cursor.fetchone()['count']
-        
-        cursor.execute("SELECT COUNT(*) as count FROM station_connections")
-        connection_count = cursor.fetchone()['count']
+        with self._reader() as conn:
+            schedule_count = conn.execute("SELECT COUNT(*) as count FROM schedules").fetchone()['count']
+            location_count = conn.execute("SELECT COUNT(*) as count FROM schedule_locations").fetchone()['count']
+            connection_count = conn.execute("SELECT COUNT(*) as count FROM station_connections").fetchone()['count']
         
         return {
             'schedules': schedule_count,
@@ -15,7 +15,7 @@ from pathlib import Path
 import re
 
 
-@dataclass
+@dataclass(slots=True)
 class Station:
     """Represents a UK rail station with all its identifiers and metadata."""
     name: str
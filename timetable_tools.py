@@ -15,6 +15,7 @@ These complement the real-time LDBWS API tools by providing:
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date, time, timedelta
+from functools import lru_cache
 import heapq
 import logging
 
@@ -23,6 +24,140 @@ from timetable_parser import StationResolver
 
 logger = logging.getLogger(__name__)
 
+# Station names/codes seen by the agent repeat constantly; fuzzy matching
+# against the full MSN station list is the expensive part of resolution
+STATION_CACHE_SIZE = 1024
+
+# OpenAI function schemas for the timetable tools (static; built once)
+TOOL_SCHEMAS: List[Dict[str, Any]] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_scheduled_trains",
+            "description": "Find scheduled trains between two stations on a specific date. "
+                         "Use this to see all scheduled services, journey times, and plan ahead. "
+                         "Complements real-time data which only shows ~2 hours ahead.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "from_station": {
+                        "type": "string",
+                        "description": "Departure station name or CRS code (e.g., 'Edinburgh' or 'EDR')"
+                    },
+                    "to_station": {
+                        "type": "string",
+                        "description": "Arrival station name or CRS code (e.g., 'Glasgow' or 'GLC')"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format (e.g., '2025-12-01')"
+                    },
+                    "departure_time": {
+                        "type": "string",
+                        "description": "Optional minimum departure time in HH:MM format (e.g., '09:30')"
+                    }
+                },
+                "required": ["from_station", "to_station", "travel_date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_journey_route",
+            "description": "Plan a journey with connections between stations. "
+                         "Finds optimal routes considering interchange times and connection possibilities.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "from_station": {
+                        "type": "string",
+                        "description": "Departure station name or CRS code"
+                    },
+                    "to_station": {
+                        "type": "string",
+                        "description": "Arrival station name or CRS code"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format"
+                    },
+                    "departure_time": {
+                        "type": "string",
+                        "description": "Minimum departure time in HH:MM format"
+                    },
+                    "max_changes": {
+                        "type": "integer",
+                        "description": "Maximum number of connections/changes (default: 2)"
+                    }
+                },
+                "required": ["from_station", "to_station", "travel_date"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "compare_schedule_vs_actual",
+            "description": "Compare scheduled train times with real-time data to identify delays, "
+                         "cancellations, and platform changes.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "train_uid": {
+                        "type": "string",
+                        "description": "Train unique identifier"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format"
+                    },
+                    "real_time_data": {
+                        "type": "object",
+                        "description": "Real-time data from LDBWS API (from get_service_details)"
+                    }
+                },
+                "required": ["train_uid", "travel_date", "real_time_data"]
+            }
+        }
+    },
+    {
+        "type": "function",
+        "function": {
+            "name": "find_alternative_route",
+            "description": "Find alternative routes when a train is delayed, cancelled, or full. "
+                         "Suggests next available trains and different connections.",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "from_station": {
+                        "type": "string",
+                        "description": "Departure station name or CRS code"
+                    },
+                    "to_station": {
+                        "type": "string",
+                        "description": "Arrival station name or CRS code"
+                    },
+                    "original_train_uid": {
+                        "type": "string",
+                        "description": "UID of the disrupted train"
+                    },
+                    "travel_date": {
+                        "type": "string",
+                        "description": "Date of travel in YYYY-MM-DD format"
+                    },
+                    "reason": {
+                        "type": "string",
+                        "description": "Reason for seeking alternative ('delay', 'cancellation', 'full')",
+                        "enum": ["delay", "cancellation", "full"]
+                    }
+                },
+                "required": ["from_station", "to_station", "original_train_uid", "travel_date"]
+            }
+        }
+    }
+]
+
 
 class TimetableTools:
     """
@@ -46,8 +181,11 @@ class TimetableTools:
         self.station_resolver = None
         if msn_path:
             self.station_resolver = StationResolver(msn_path)
+        
+        # Per-instance memo so it is dropped along with this resolver
+        self._resolve_station = lru_cache(maxsize=STATION_CACHE_SIZE)(self._resolve_station)
             
-        logger.info(f"Timetable tools initialized (DB: {db_path})")
+        logger.info("Timetable tools initialized (DB: %s)", db_path)
         
     def close(self):
         """Close database connection."""
@@ -107,7 +245,7 @@ class TimetableTools:
             }
             
         except Exception as e:
-            logger.error(f"Error finding scheduled trains: {e}")
+            logger.error("Error finding scheduled trains: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -192,7 +330,7 @@ class TimetableTools:
             }
             
         except Exception as e:
-            logger.error(f"Error finding journey route: {e}")
+            logger.error("Error finding journey route: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -264,7 +402,7 @@ class TimetableTools:
             }
             
         except Exception as e:
-            logger.error(f"Error comparing schedule vs actual: {e}")
+            logger.error("Error comparing schedule vs actual: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -334,7 +472,7 @@ class TimetableTools:
             }
             
         except Exception as e:
-            logger.error(f"Error finding alternative route: {e}")
+            logger.error("Error finding alternative route: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -372,131 +510,4 @@ class TimetableTools:
         Returns:
             List of tool schemas for OpenAI function calling
         """
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_scheduled_trains",
-                    "description": "Find scheduled trains between two stations on a specific date. "
-                                 "Use this to see all scheduled services, journey times, and plan ahead. "
-                                 "Complements real-time data which only shows ~2 hours ahead.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "from_station": {
-                                "type": "string",
-                                "description": "Departure station name or CRS code (e.g., 'Edinburgh' or 'EDR')"
-                            },
-                            "to_station": {
-                                "type": "string",
-                                "description": "Arrival station name or CRS code (e.g., 'Glasgow' or 'GLC')"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format (e.g., '2025-12-01')"
-                            },
-                            "departure_time": {
-                                "type": "string",
-                                "description": "Optional minimum departure time in HH:MM format (e.g., '09:30')"
-                            }
-                        },
-                        "required": ["from_station", "to_station", "travel_date"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "find_journey_route",
-                    "description": "Plan a journey with connections between stations. "
-                                 "Finds optimal routes considering interchange times and connection possibilities.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "from_station": {
-                                "type": "string",
-                                "description": "Departure station name or CRS code"
-                            },
-                            "to_station": {
-                                "type": "string",
-                                "description": "Arrival station name or CRS code"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format"
-                            },
-                            "departure_time": {
-                                "type": "string",
-                                "description": "Minimum departure time in HH:MM format"
-                            },
-                            "max_changes": {
-                                "type": "integer",
-                                "description": "Maximum number of connections/changes (default: 2)"
-                            }
-                        },
-                        "required": ["from_station", "to_station", "travel_date"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "compare_schedule_vs_actual",
-                    "description": "Compare scheduled train times with real-time data to identify delays, "
-                                 "cancellations, and platform changes.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "train_uid": {
-                                "type": "string",
-                                "description": "Train unique identifier"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format"
-                            },
-                            "real_time_data": {
-                                "type": "object",
-                                "description": "Real-time data from LDBWS API (from get_service_details)"
-                            }
-                        },
-                        "required": ["train_uid", "travel_date", "real_time_data"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "find_alternative_route",
-                    "description": "Find alternative routes when a train is delayed, cancelled, or full. "
-                                 "Suggests next available trains and different connections.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "from_station": {
-                                "type": "string",
-                                "description": "Departure station name or CRS code"
-                            },
-                            "to_station": {
-                                "type": "string",
-                                "description": "Arrival station name or CRS code"
-                            },
-                            "original_train_uid": {
-                                "type": "string",
-                                "description": "UID of the disrupted train"
-                            },
-                            "travel_date": {
-                                "type": "string",
-                                "description": "Date of travel in YYYY-MM-DD format"
-                            },
-                            "reason": {
-                                "type": "string",
-                                "description": "Reason for seeking alternative ('delay', 'cancellation', 'full')",
-                                "enum": ["delay", "cancellation", "full"]
-                            }
-                        },
-                        "required": ["from_station", "to_station", "original_train_uid", "travel_date"]
-                    }
-                }
-            }
-        ]
+        return list(TOOL_SCHEMAS)
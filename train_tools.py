@@ -22,12 +22,18 @@ Environment Variables:
     DISRUPTIONS_API_KEY or RDG_API_KEY - Rail Delivery Group API key
 """
 
+import logging
 import os
+import threading
+import time
 import xml.etree.ElementTree as ET
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Union
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
+import orjson
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from zeep import Client, Settings, xsd
 
 from models import (
@@ -49,6 +55,8 @@ from models import (
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # ============================================================================
 # Configuration Constants
 # ============================================================================
@@ -57,6 +65,18 @@ DEFAULT_WSDL = 'http://lite.realtime.nationalrail.co.uk/OpenLDBWS/wsdl.aspx?ver=
 INCIDENTS_API_URL = 'https://api1.raildata.org.uk/1010-knowlegebase-incidents-xml-feed1_0/incidents.xml'
 SERVICE_DETAILS_API_URL = 'https://api1.raildata.org.uk/1010-service-details1_2/LDBWS/api/20220120/GetServiceDetails'
 
+# How long (seconds) a fetched incidents feed is reused before re-fetching
+INCIDENTS_CACHE_TTL_SECONDS = 10
+# Oldest cached incidents feed that may be served while a refresh is pending
+INCIDENTS_MAX_STALE_SECONDS = 300
+# Wait (seconds) after a failed incidents refresh before trying the feed again
+INCIDENTS_RETRY_BACKOFF_SECONDS = 30
+
+# REST API connection pooling and (connect, read) timeouts in seconds
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 16
+HTTP_TIMEOUT = (5, 10)
+
 # XML Namespaces for incident feed
 INCIDENT_NAMESPACES = {
     'inc': 'http://nationalrail.co.uk/xml/incident',
@@ -105,6 +125,26 @@ class TrainTools:
         
         # Disruptions API configuration
         self.disruptions_api_key = os.getenv('DISRUPTIONS_API_KEY') or os.getenv('RDG_API_KEY')
+        
+        # Shared HTTP session so REST calls reuse pooled keep-alive connections
+        self._http = self._create_http_session()
+        
+        # Incidents feed cache: (checked_at, fetched_at, xml_text), shared by all
+        # callers; fetched_at only moves when a new body is downloaded
+        self.incidents_cache_ttl = INCIDENTS_CACHE_TTL_SECONDS
+        self.incidents_max_stale = INCIDENTS_MAX_STALE_SECONDS
+        self.incidents_retry_backoff = INCIDENTS_RETRY_BACKOFF_SECONDS
+        self._incidents_cache: Optional[Tuple[float, float, str]] = None
+        self._incidents_validators: Dict[str, str] = {}
+        # Held for the duration of any feed fetch, including background refreshes
+        self._incidents_lock = threading.Lock()
+        self._incidents_refresher: Optional[threading.Thread] = None
+        # Monotonic time of the last failed fetch, None once a fetch succeeds
+        self._incidents_failed_at: Optional[float] = None
+        
+        # Parsed feed tagged with its fetched_at: (fetched_at, upper-cased routes
+        # aligned with the network-wide list, incidents keyed by station filter)
+        self._incidents_memo: Tuple[Optional[float], List[str], Dict[Optional[str], List[Incident]]] = (None, [], {})
     
     # ------------------------------------------------------------------------
     # Private Helper Methods
@@ -127,6 +167,21 @@ class TrainTools:
         settings = Settings(strict=False)
         return Client(wsdl=self.wsdl, settings=settings)
     
+    def _create_http_session(self) -> requests.Session:
+        """Create a pooled HTTP session for the REST APIs."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_CONNECTIONS,
+            pool_maxsize=HTTP_POOL_MAXSIZE,
+            # Retry a failed connect only: a read timeout means the upstream
+            # already took the request, and a second attempt doubles the wait.
+            max_retries=Retry(total=1, connect=1, read=0, status=0,
+                              backoff_factor=0.1, allowed_methods=['GET'])
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
     def _extract_destination_name(self, service) -> str:
         """Extract destination name from service object."""
         if hasattr(service, 'destination') and service.destination:
@@ -473,13 +528,27 @@ class TrainTools:
                     message='DISRUPTIONS_API_KEY (or RDG_API_KEY) is not set in environment.'
                 )
             
-            headers = {'x-apikey': self.disruptions_api_key, 'User-Agent': 'TrainTools/1.0'}
-            response = requests.get(INCIDENTS_API_URL, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            # Parse XML with namespace handling
-            root = ET.fromstring(response.text)
-            incidents = self._parse_incidents(root, station_code)
+            fetched_at, xml_text = self._fetch_incidents_feed()
+
+            # Parse the feed once per fetch; station queries filter the parsed list
+            memo = self._incidents_memo
+            if memo[0] != fetched_at:
+                # Parse XML with namespace handling
+                all_incidents = self._parse_incidents(ET.fromstring(xml_text), None)
+                routes_upper = [(i.routes_affected or '').upper() for i in all_incidents]
+                memo = (fetched_at, routes_upper, {None: all_incidents})
+                self._incidents_memo = memo
+            _, routes_upper, by_station = memo
+            station_key = station_code.upper() if station_code else None
+            incidents = by_station.get(station_key)
+            if incidents is None:
+                incidents = [
+                    incident
+                    for incident, routes in zip(by_station[None], routes_upper)
+                    if not routes or station_key in routes
+                ]
+                by_station[station_key] = incidents
+            incidents = list(incidents)
 
             return StationMessagesResponse(
                 messages=incidents,
@@ -504,6 +573,93 @@ class TrainTools:
                 message=f"Unable to parse station messages XML: {str(e)}"
             )
     
+    def _fetch_incidents_feed(self) -> Tuple[float, str]:
+        """
+        Return ``(fetched_at, xml_text)`` for the incidents feed, reusing a cached copy.
+        
+        A copy older than ``incidents_cache_ttl`` seconds is still returned
+        immediately while a single background thread refreshes it for later
+        callers (stale-while-revalidate). Once it is older than
+        ``incidents_max_stale`` seconds it is no longer served: the caller
+        blocks on a fresh fetch, as on a cold cache. After a failed fetch the
+        feed is not contacted again for ``incidents_retry_backoff`` seconds.
+        
+        Raises:
+            requests.RequestException: If a blocking fetch fails, or one failed
+                within the backoff window
+        """
+        cached = self._incidents_cache
+        now = time.monotonic()
+        if cached is None or now - cached[0] >= self.incidents_max_stale:
+            with self._incidents_lock:
+                cached = self._incidents_cache
+                if cached is None or time.monotonic() - cached[0] >= self.incidents_max_stale:
+                    if self._incidents_backing_off():
+                        raise requests.ConnectionError(
+                            "Incidents feed unavailable, retrying shortly"
+                        )
+                    self._refresh_incidents_feed()
+                    cached = self._incidents_cache
+        elif now - cached[0] >= self.incidents_cache_ttl and not self._incidents_backing_off():
+            # Non-blocking acquire: if a fetch is already running, let it finish
+            if self._incidents_lock.acquire(blocking=False):
+                self._incidents_refresher = threading.Thread(
+                    target=self._background_refresh_incidents,
+                    name='incidents-refresh',
+                    daemon=True
+                )
+                self._incidents_refresher.start()
+        return cached[1], cached[2]
+    
+    def _background_refresh_incidents(self) -> None:
+        """Refresh the incidents feed, then release the lock taken by the caller."""
+        try:
+            self._refresh_incidents_feed()
+        except requests.RequestException as e:
+            logger.warning("Incidents feed refresh failed, serving cached copy: %s", e)
+        finally:
+            self._incidents_lock.release()
+    
+    def _incidents_backing_off(self) -> bool:
+        """Return True while a recent failed fetch should not be retried yet."""
+        failed_at = self._incidents_failed_at
+        return failed_at is not None and time.monotonic() - failed_at < self.incidents_retry_backoff
+    
+    def _refresh_incidents_feed(self) -> None:
+        """
+        Download the incidents feed into the cache. Caller must hold ``_incidents_lock``.
+        
+        A cached copy is revalidated with the feed's ETag/Last-Modified, so an
+        unchanged feed (304) keeps its body and fetched_at. A failure is
+        recorded in ``_incidents_failed_at`` before it propagates.
+        """
+        cached = self._incidents_cache
+        headers = {'x-apikey': self.disruptions_api_key, 'User-Agent': 'TrainTools/1.0'}
+        if cached is not None:
+            headers.update(self._incidents_validators)
+        try:
+            response = self._http.get(INCIDENTS_API_URL, headers=headers, timeout=HTTP_TIMEOUT)
+            response.raise_for_status()
+        except requests.RequestException:
+            self._incidents_failed_at = time.monotonic()
+            raise
+        
+        self._incidents_failed_at = None
+        now = time.monotonic()
+        if cached is not None and response.status_code == 304:
+            self._incidents_cache = (now, cached[1], cached[2])
+            return
+        
+        validators = {}
+        etag = response.headers.get('ETag')
+        if etag:
+            validators['If-None-Match'] = etag
+        last_modified = response.headers.get('Last-Modified')
+        if last_modified:
+            validators['If-Modified-Since'] = last_modified
+        self._incidents_validators = validators
+        self._incidents_cache = (now, now, response.text)
+    
     def _parse_incidents(self, root: ET.Element, station_filter: Optional[str]) -> List[Incident]:
         """
         Parse incidents from XML with namespace handling.
@@ -662,10 +818,10 @@ class TrainTools:
             url = f"{SERVICE_DETAILS_API_URL}/{service_id}"
             headers = {'x-apikey': SERVICE_DETAILS_API_KEY, 'User-Agent': 'TrainTools/1.0'}
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self._http.get(url, headers=headers, timeout=HTTP_TIMEOUT)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             
             # Extract service information
             service_data = data